@@ -9,6 +9,36 @@ Este módulo valida 6 padrões principais:
 5. Mode Pattern
 6. RoleMixin Pattern
 """
+import sys
+from collections import Counter
+from enum import IntEnum
+
+
+# Bit de cada modificador de genset (ver _modifier_mask)
+_MOD_BITS = {
+    'disjoint': 1 << 0,
+    'complete': 1 << 1,
+    'overlapping': 1 << 2,
+    'incomplete': 1 << 3,
+}
+
+
+def _modifier_mask(modifiers):
+    """Converte uma lista de modificadores de genset em máscara de bits."""
+    mask = 0
+    for mod in modifiers:
+        mask |= _MOD_BITS.get(mod, 0)
+    return mask
+
+
+class PType(IntEnum):
+    """Tag numérica de cada tipo de padrão, usada no despacho da formatação."""
+    SUBKIND = 0
+    ROLE = 1
+    PHASE = 2
+    RELATOR = 3
+    MODE = 4
+    ROLEMIXIN = 5
 
 
 class PatternValidator:
@@ -19,6 +49,84 @@ class PatternValidator:
     estão completos ou incompletos.
     """
 
+    # Descrição de cada tipo de padrão completo (ver _format_complete_pattern)
+    _FORMATTERS = {
+        PType.SUBKIND: lambda d: f"Kind '{d['kind']}' com subkinds {d['subkinds']} e genset '{d['genset']}'",
+        PType.ROLE: lambda d: f"Kind '{d['kind']}' com roles {d['roles']} e genset '{d['genset']}'",
+        PType.PHASE: lambda d: f"Kind '{d['kind']}' com phases {d['phases']} e genset '{d['genset']}'",
+        PType.RELATOR: lambda d: f"Relator '{d['relator']}' com {d['mediations']} mediações",
+        PType.MODE: lambda d: f"Mode '{d['mode']}' com @characterization e @externalDependence",
+        PType.ROLEMIXIN: lambda d: f"RoleMixin '{d['rolemixin']}' com roles {d['roles']} e genset '{d['genset']}'",
+    }
+
+    # Regras dos padrões de especialização (ver _validate_specialization_pattern)
+    #   Subkind:   genset DISJOINT COMPLETE agrupando os subkinds de um kind
+    #   Role:      genset COMPLETE (disjoint NÃO se aplica a roles) agrupando os roles de um kind
+    #   Phase:     genset DISJOINT (obrigatório), COMPLETE (opcional) agrupando as phases de um kind
+    #   RoleMixin: genset DISJOINT COMPLETE agrupando os roles que especializam o roleMixin
+    _SPEC_RULES = {
+        PType.SUBKIND: {
+            'type': 'Subkind Pattern',
+            'tag': PType.SUBKIND,
+            'general': 'kind',
+            'general_key': 'kind',
+            'specific': 'subkind',
+            'specifics_key': 'subkinds',
+            'required': ('disjoint', 'complete'),
+            'forbidden': (),
+            'error': 'Falta genset disjoint complete',
+            'missing_specifics_error': None,
+            'missing_specifics_suggestion': None,
+        },
+        PType.ROLE: {
+            'type': 'Role Pattern',
+            'tag': PType.ROLE,
+            'general': 'kind',
+            'general_key': 'kind',
+            'specific': 'role',
+            'specifics_key': 'roles',
+            'required': ('complete',),
+            'forbidden': ('disjoint',),  # Roles NÃO podem ser disjoint
+            'error': 'Falta genset complete (sem disjoint)',
+            'missing_specifics_error': None,
+            'missing_specifics_suggestion': None,
+        },
+        PType.PHASE: {
+            'type': 'Phase Pattern',
+            'tag': PType.PHASE,
+            'general': 'kind',
+            'general_key': 'kind',
+            'specific': 'phase',
+            'specifics_key': 'phases',
+            'required': ('disjoint',),  # Disjoint é obrigatório
+            'forbidden': (),
+            'error': 'Falta genset disjoint (obrigatório para phases)',
+            'missing_specifics_error': None,
+            'missing_specifics_suggestion': None,
+        },
+        PType.ROLEMIXIN: {
+            'type': 'RoleMixin Pattern',
+            'tag': PType.ROLEMIXIN,
+            'general': 'roleMixin',
+            'general_key': 'rolemixin',
+            'specific': 'role',
+            'specifics_key': 'roles',
+            'required': ('disjoint', 'complete'),
+            'forbidden': (),
+            'error': 'Falta genset disjoint complete',
+            'missing_specifics_error': 'Precisa de pelo menos 2 roles especializando {name}',
+            'missing_specifics_suggestion': 'Adicione roles que especializam {name}',
+        },
+    }
+
+    # Sugestões de genset montadas só na formatação (ver _format_incomplete_pattern)
+    _SUGGESTIONS = {
+        PType.SUBKIND: lambda d: f'Adicione: disjoint complete genset {d["kind"]}_Genset {{ general {d["kind"]} specifics {", ".join(d["subkinds"])} }}',
+        PType.ROLE: lambda d: f'Adicione: complete genset {d["kind"]}_Role_Genset {{ general {d["kind"]} specifics {", ".join(d["roles"])} }}',
+        PType.PHASE: lambda d: f'Adicione: disjoint complete genset {d["kind"]}_Phase_Genset {{ general {d["kind"]} specifics {", ".join(d["phases"])} }}',
+        PType.ROLEMIXIN: lambda d: f'Adicione: disjoint complete genset {d["rolemixin"]}_Genset {{ general {d["rolemixin"]} specifics {", ".join(d["roles"])} }}',
+    }
+
     def __init__(self, analysis_data):
         """
         Inicializa o validador com os dados da análise sintática.
@@ -30,6 +138,42 @@ class PatternValidator:
         self.gensets = analysis_data.get('gensets', [])
         self.relations = analysis_data.get('relations', [])
 
+        # Internar nomes e estereótipos: comparações e buscas nos índices
+        # abaixo passam a resolver por identidade na maioria dos casos
+        for c in self.classes:
+            c['stereotype'] = sys.intern(c['stereotype'])
+            c['name'] = sys.intern(c['name'])
+            c['parents'] = [sys.intern(p) for p in c.get('parents', [])]
+        for g in self.gensets:
+            if g.get('general') is not None:
+                g['general'] = sys.intern(g['general'])
+            g['specifics'] = [sys.intern(s) for s in g.get('specifics', [])]
+            g['modifiers'] = [sys.intern(m) for m in g.get('modifiers', [])]
+
+        # Índice estereótipo -> classes (evita varrer self.classes a cada padrão)
+        self._by_stereotype = {}
+        for c in self.classes:
+            self._by_stereotype.setdefault(c['stereotype'], []).append(c)
+
+        # Índice (pai, estereótipo) -> classes filhas
+        self._children = {}
+        for c in self.classes:
+            # dict.fromkeys descarta pais repetidos mantendo a ordem
+            for parent in dict.fromkeys(c.get('parents', [])):
+                self._children.setdefault((parent, c['stereotype']), []).append(c)
+
+        # Índice classe geral -> (genset, specifics, máscara de modificadores)
+        self._gensets_by_general = {}
+        for g in self.gensets:
+            self._gensets_by_general.setdefault(g.get('general'), []).append((
+                g,
+                frozenset(g.get('specifics', [])),
+                _modifier_mask(g.get('modifiers', []))
+            ))
+
+        # Cache de _find_genset_for_classes (os gensets não mudam após o __init__)
+        self._genset_cache = {}
+
         # Armazena padrões encontrados
         self.complete_patterns = []    # Padrões completos (corretos)
         self.incomplete_patterns = []  # Padrões incompletos (com erros)
@@ -47,16 +191,16 @@ class PatternValidator:
         self.incomplete_patterns = []
 
         # Validar cada padrão
-        self._validate_subkind_pattern()
-        self._validate_role_pattern()
-        self._validate_phase_pattern()
+        self._validate_specialization_pattern(self._SPEC_RULES[PType.SUBKIND])
+        self._validate_specialization_pattern(self._SPEC_RULES[PType.ROLE])
+        self._validate_specialization_pattern(self._SPEC_RULES[PType.PHASE])
         self._validate_relator_pattern()
         self._validate_mode_pattern()
-        self._validate_rolemixin_pattern()
+        self._validate_specialization_pattern(self._SPEC_RULES[PType.ROLEMIXIN])
 
         # Formatar resultados para a GUI
-        formatted_complete = [self._format_complete_pattern(p) for p in self.complete_patterns]
-        formatted_incomplete = [self._format_incomplete_pattern(p) for p in self.incomplete_patterns]
+        formatted_complete = list(map(self._format_complete_pattern, self.complete_patterns))
+        formatted_incomplete = list(map(self._format_incomplete_pattern, self.incomplete_patterns))
 
         # Retornar dicionário com os resultados formatados
         return {
@@ -78,20 +222,8 @@ class PatternValidator:
         line = pattern_data.get('line', '-')
 
         # Criar descrição detalhada baseada no tipo de padrão
-        if 'Subkind' in pattern_type:
-            details = f"Kind '{pattern_data['kind']}' com subkinds {pattern_data['subkinds']} e genset '{pattern_data['genset']}'"
-        elif 'Role' in pattern_type and 'RoleMixin' not in pattern_type:
-            details = f"Kind '{pattern_data['kind']}' com roles {pattern_data['roles']} e genset '{pattern_data['genset']}'"
-        elif 'Phase' in pattern_type:
-            details = f"Kind '{pattern_data['kind']}' com phases {pattern_data['phases']} e genset '{pattern_data['genset']}'"
-        elif 'Relator' in pattern_type:
-            details = f"Relator '{pattern_data['relator']}' com {pattern_data['mediations']} mediações"
-        elif 'Mode' in pattern_type:
-            details = f"Mode '{pattern_data['mode']}' com @characterization e @externalDependence"
-        elif 'RoleMixin' in pattern_type:
-            details = f"RoleMixin '{pattern_data['rolemixin']}' com roles {pattern_data['roles']} e genset '{pattern_data['genset']}'"
-        else:
-            details = str(pattern_data)
+        formatter = self._FORMATTERS.get(pattern_data.get('tag'))
+        details = formatter(pattern_data) if formatter else str(pattern_data)
 
         return {
             'pattern': pattern_type,
@@ -109,25 +241,31 @@ class PatternValidator:
         Returns:
             Dicionário formatado com 'pattern', 'error', 'suggestion' e 'line'
         """
+        if 'suggestion_template' in pattern_data:
+            suggestion = self._SUGGESTIONS[pattern_data['suggestion_template']](pattern_data)
+        else:
+            suggestion = pattern_data['suggestion']
+
         return {
             'pattern': pattern_data['type'],
             'error': pattern_data['error'],
-            'suggestion': pattern_data['suggestion'],
+            'suggestion': suggestion,
             'line': pattern_data.get('line', '-')
         }
 
     # =========================================================================
-    # 1. SUBKIND PATTERN
+    # 1. PADRÕES DE ESPECIALIZAÇÃO (SUBKIND, ROLE, PHASE, ROLEMIXIN)
     # =========================================================================
 
-    def _validate_subkind_pattern(self):
+    def _validate_specialization_pattern(self, rule):
         """
-        Valida o padrão Subkind.
+        Valida um padrão de especialização descrito por uma regra de _SPEC_RULES.
 
-        REGRA: Se há subkinds especializando um kind, deve haver um
-               genset DISJOINT COMPLETE agrupando esses subkinds.
+        REGRA: Se há 2 ou mais classes do estereótipo 'specific' especializando
+               uma classe do estereótipo 'general', deve haver um genset com os
+               modificadores 'required' (e sem os 'forbidden') agrupando-as.
 
-        Exemplo correto:
+        Exemplo correto (Subkind Pattern):
             kind ClassName
             subkind SubclassName1 specializes ClassName
             subkind SubclassName2 specializes ClassName
@@ -136,179 +274,68 @@ class PatternValidator:
                 general ClassName
                 specifics SubclassName1, SubclassName2
             }
-        """
-        # Passo 1: Encontrar todos os kinds
-        kinds = [c for c in self.classes if c['stereotype'] == 'kind']
-
-        for kind in kinds:
-            kind_name = kind['name']
-
-            # Passo 2: Encontrar subkinds que especializam este kind
-            subkinds = [
-                c for c in self.classes
-                if c['stereotype'] == 'subkind' and kind_name in c.get('parents', [])
-            ]
-
-            # Se não há subkinds, não há padrão a validar
-            if len(subkinds) < 2:
-                continue
-
-            # Passo 3: Verificar se existe genset para esses subkinds
-            genset_found = self._find_genset_for_classes(
-                kind_name,
-                [s['name'] for s in subkinds],
-                required_modifiers=['disjoint', 'complete']
-            )
-
-            # Passo 4: Registrar resultado
-            if genset_found:
-                self.complete_patterns.append({
-                    'type': 'Subkind Pattern',
-                    'kind': kind_name,
-                    'subkinds': [s['name'] for s in subkinds],
-                    'genset': genset_found['name'],
-                    'line': kind['line']
-                })
-            else:
-                self.incomplete_patterns.append({
-                    'type': 'Subkind Pattern',
-                    'kind': kind_name,
-                    'subkinds': [s['name'] for s in subkinds],
-                    'error': 'Falta genset disjoint complete',
-                    'suggestion': f'Adicione: disjoint complete genset {kind_name}_Genset {{ general {kind_name} specifics {", ".join([s["name"] for s in subkinds])} }}',
-                    'line': kind['line']
-                })
-
-    # =========================================================================
-    # 2. ROLE PATTERN
-    # =========================================================================
-
-    def _validate_role_pattern(self):
-        """
-        Valida o padrão Role.
 
-        REGRA: Se há roles especializando um kind, deve haver um
-               genset COMPLETE (disjoint NÃO se aplica a roles).
-
-        Exemplo correto:
-            kind ClassName
-            role Role_Name1 specializes ClassName
-            role Role_Name2 specializes ClassName
-
-            complete genset Class_Role_Genset_Name {
-                general ClassName
-                specifics Role_Name1, Role_Name2
-            }
+        Args:
+            rule: Dicionário de _SPEC_RULES com a configuração do padrão
         """
-        # Passo 1: Encontrar todos os kinds
-        kinds = [c for c in self.classes if c['stereotype'] == 'kind']
-
-        for kind in kinds:
-            kind_name = kind['name']
-
-            # Passo 2: Encontrar roles que especializam este kind
-            roles = [
-                c for c in self.classes
-                if c['stereotype'] == 'role' and kind_name in c.get('parents', [])
-            ]
-
-            # Se não há roles suficientes, não há padrão
-            if len(roles) < 2:
+        # Passo 1: Encontrar todas as classes gerais
+        generals = self._by_stereotype.get(rule['general'], [])
+        if not generals:
+            return
+
+        required_mask = _modifier_mask(rule['required'])
+        forbidden_mask = _modifier_mask(rule['forbidden'])
+
+        for general in generals:
+            general_name = general['name']
+
+            # Passo 2: Encontrar classes que especializam a classe geral
+            specifics = self._children.get((general_name, rule['specific']), [])
+
+            # Sem especializações suficientes: só o RoleMixin acusa erro
+            if len(specifics) < 2:
+                if rule['missing_specifics_error']:
+                    self.incomplete_patterns.append({
+                        'type': rule['type'],
+                        rule['general_key']: general_name,
+                        'error': rule['missing_specifics_error'].format(name=general_name),
+                        'suggestion': rule['missing_specifics_suggestion'].format(name=general_name),
+                        'line': general['line']
+                    })
                 continue
 
-            # Passo 3: Verificar genset (deve ser complete, NÃO disjoint)
-            genset_found = self._find_genset_for_classes(
-                kind_name,
-                [r['name'] for r in roles],
-                required_modifiers=['complete'],
-                forbidden_modifiers=['disjoint']  # Roles NÃO podem ser disjoint
-            )
+            specific_names = [s['name'] for s in specifics]
 
-            # Passo 4: Registrar resultado
-            if genset_found:
-                self.complete_patterns.append({
-                    'type': 'Role Pattern',
-                    'kind': kind_name,
-                    'roles': [r['name'] for r in roles],
-                    'genset': genset_found['name'],
-                    'line': kind['line']
-                })
-            else:
-                self.incomplete_patterns.append({
-                    'type': 'Role Pattern',
-                    'kind': kind_name,
-                    'roles': [r['name'] for r in roles],
-                    'error': 'Falta genset complete (sem disjoint)',
-                    'suggestion': f'Adicione: complete genset {kind_name}_Role_Genset {{ general {kind_name} specifics {", ".join([r["name"] for r in roles])} }}',
-                    'line': kind['line']
-                })
-
-    # =========================================================================
-    # 3. PHASE PATTERN
-    # =========================================================================
-
-    def _validate_phase_pattern(self):
-        """
-        Valida o padrão Phase.
-
-        REGRA: Se há phases especializando um kind, deve haver um
-               genset DISJOINT (obrigatório), COMPLETE (opcional).
-
-        Exemplo correto:
-            kind ClassName
-            phase Phase_Name1 specializes ClassName
-            phase Phase_Name2 specializes ClassName
-            phase Phase_NameN specializes ClassName
-
-            disjoint complete genset Class_Phase_Genset_Name {
-                general ClassName
-                specifics Phase_Name1, Phase_Name2, Phase_NameN
-            }
-        """
-        # Passo 1: Encontrar todos os kinds
-        kinds = [c for c in self.classes if c['stereotype'] == 'kind']
-
-        for kind in kinds:
-            kind_name = kind['name']
-
-            # Passo 2: Encontrar phases que especializam este kind
-            phases = [
-                c for c in self.classes
-                if c['stereotype'] == 'phase' and kind_name in c.get('parents', [])
-            ]
-
-            # Se não há phases suficientes, não há padrão
-            if len(phases) < 2:
-                continue
-
-            # Passo 3: Verificar genset (DEVE ter disjoint)
+            # Passo 3: Verificar se existe genset para essas classes
             genset_found = self._find_genset_for_classes(
-                kind_name,
-                [p['name'] for p in phases],
-                required_modifiers=['disjoint']  # Disjoint é obrigatório
+                general_name,
+                specific_names,
+                required_mask=required_mask,
+                forbidden_mask=forbidden_mask
             )
 
             # Passo 4: Registrar resultado
             if genset_found:
                 self.complete_patterns.append({
-                    'type': 'Phase Pattern',
-                    'kind': kind_name,
-                    'phases': [p['name'] for p in phases],
-                    'genset': genset_found['name'],
-                    'line': kind['line']
+                    'type': rule['type'],
+                    'tag': rule['tag'],
+                    rule['general_key']: general_name,
+                    rule['specifics_key']: specific_names,
+                    'genset': genset_found,
+                    'line': general['line']
                 })
             else:
                 self.incomplete_patterns.append({
-                    'type': 'Phase Pattern',
-                    'kind': kind_name,
-                    'phases': [p['name'] for p in phases],
-                    'error': 'Falta genset disjoint (obrigatório para phases)',
-                    'suggestion': f'Adicione: disjoint complete genset {kind_name}_Phase_Genset {{ general {kind_name} specifics {", ".join([p["name"] for p in phases])} }}',
-                    'line': kind['line']
+                    'type': rule['type'],
+                    rule['general_key']: general_name,
+                    rule['specifics_key']: specific_names,
+                    'error': rule['error'],
+                    'suggestion_template': rule['tag'],
+                    'line': general['line']
                 })
 
     # =========================================================================
-    # 4. RELATOR PATTERN
+    # 2. RELATOR PATTERN
     # =========================================================================
 
     def _validate_relator_pattern(self):
@@ -330,32 +357,22 @@ class PatternValidator:
             }
         """
         # Passo 1: Encontrar todos os relators
-        relators = [c for c in self.classes if c['stereotype'] == 'relator']
+        relators = self._by_stereotype.get('relator', [])
+        if not relators:
+            return
 
         for relator in relators:
             relator_name = relator['name']
 
-            # Passo 2: Encontrar relações @mediation dentro do relator
-            mediations = [
-                r for r in self.relations
-                if r.get('internal') and r.get('stereotype') == 'mediation'
-                # Verificar se pertence a este relator comparando linhas próximas
-            ]
-
-            # Filtrar mediations que estão no corpo deste relator
-            # (simplificado: assume que relações internas pertencem ao relator mais próximo)
-            relator_mediations = []
-            for med in mediations:
-                # Verificar se a mediação está dentro do corpo do relator
-                if relator.get('body'):
-                    for member in relator['body']:
-                        if member.get('stereotype') == 'mediation':
-                            relator_mediations.append(member)
+            # Passo 2: Encontrar relações @mediation no corpo do relator
+            body = relator.get('body') or ()
+            relator_mediations = [m for m in body if m.get('stereotype') == 'mediation']
 
             # Passo 3: Validar (deve ter pelo menos 2 mediações)
             if len(relator_mediations) >= 2:
                 self.complete_patterns.append({
                     'type': 'Relator Pattern',
+                    'tag': PType.RELATOR,
                     'relator': relator_name,
                     'mediations': len(relator_mediations),
                     'line': relator['line']
@@ -371,7 +388,7 @@ class PatternValidator:
                 })
 
     # =========================================================================
-    # 5. MODE PATTERN
+    # 3. MODE PATTERN
     # =========================================================================
 
     def _validate_mode_pattern(self):
@@ -389,7 +406,9 @@ class PatternValidator:
             }
         """
         # Passo 1: Encontrar todos os modes
-        modes = [c for c in self.classes if c['stereotype'] == 'mode']
+        modes = self._by_stereotype.get('mode', [])
+        if not modes:
+            return
 
         for mode in modes:
             mode_name = mode['name']
@@ -398,17 +417,22 @@ class PatternValidator:
             has_characterization = False
             has_external_dependence = False
 
-            if mode.get('body'):
-                for member in mode['body']:
-                    if member.get('stereotype') == 'characterization':
-                        has_characterization = True
-                    if member.get('stereotype') == 'externalDependence':
-                        has_external_dependence = True
+            for member in mode.get('body') or ():
+                stereotype = member.get('stereotype')
+                if stereotype == 'characterization':
+                    has_characterization = True
+                elif stereotype == 'externalDependence':
+                    has_external_dependence = True
+
+                # Ambas encontradas: não há por que olhar o resto do corpo
+                if has_characterization and has_external_dependence:
+                    break
 
             # Passo 3: Validar
             if has_characterization and has_external_dependence:
                 self.complete_patterns.append({
                     'type': 'Mode Pattern',
+                    'tag': PType.MODE,
                     'mode': mode_name,
                     'line': mode['line']
                 })
@@ -427,123 +451,55 @@ class PatternValidator:
                     'line': mode['line']
                 })
 
-    # =========================================================================
-    # 6. ROLEMIXIN PATTERN
-    # =========================================================================
-
-    def _validate_rolemixin_pattern(self):
-        """
-        Valida o padrão RoleMixin.
-
-        REGRA: Um roleMixin deve ter:
-               - Roles que o especializam
-               - Um genset agrupando esses roles
-
-        Exemplo correto:
-            kind ClassName1
-            kind ClassName2
-            roleMixin RoleMixin_Name
-            role Role_Name1 specializes ClassName1, RoleMixin_Name
-            role Role_Name2 specializes ClassName2, RoleMixin_Name
-
-            disjoint complete genset RoleMixin_Genset_Name {
-                general RoleMixin_Name
-                specifics Role_Name1, Role_Name2
-            }
-        """
-        # Passo 1: Encontrar todos os rolemixins
-        rolemixins = [c for c in self.classes if c['stereotype'] == 'roleMixin']
-
-        for rolemixin in rolemixins:
-            rolemixin_name = rolemixin['name']
-
-            # Passo 2: Encontrar roles que especializam este rolemixin
-            roles = [
-                c for c in self.classes
-                if c['stereotype'] == 'role' and rolemixin_name in c.get('parents', [])
-            ]
-
-            # Se não há roles, padrão incompleto
-            if len(roles) < 2:
-                self.incomplete_patterns.append({
-                    'type': 'RoleMixin Pattern',
-                    'rolemixin': rolemixin_name,
-                    'error': f'Precisa de pelo menos 2 roles especializando {rolemixin_name}',
-                    'suggestion': f'Adicione roles que especializam {rolemixin_name}',
-                    'line': rolemixin['line']
-                })
-                continue
-
-            # Passo 3: Verificar se existe genset
-            genset_found = self._find_genset_for_classes(
-                rolemixin_name,
-                [r['name'] for r in roles],
-                required_modifiers=['disjoint', 'complete']
-            )
-
-            # Passo 4: Registrar resultado
-            if genset_found:
-                self.complete_patterns.append({
-                    'type': 'RoleMixin Pattern',
-                    'rolemixin': rolemixin_name,
-                    'roles': [r['name'] for r in roles],
-                    'genset': genset_found['name'],
-                    'line': rolemixin['line']
-                })
-            else:
-                self.incomplete_patterns.append({
-                    'type': 'RoleMixin Pattern',
-                    'rolemixin': rolemixin_name,
-                    'roles': [r['name'] for r in roles],
-                    'error': 'Falta genset disjoint complete',
-                    'suggestion': f'Adicione: disjoint complete genset {rolemixin_name}_Genset {{ general {rolemixin_name} specifics {", ".join([r["name"] for r in roles])} }}',
-                    'line': rolemixin['line']
-                })
-
     # =========================================================================
     # MÉTODOS AUXILIARES
     # =========================================================================
 
     def _find_genset_for_classes(self, general_class, specific_classes,
-                                  required_modifiers=None, forbidden_modifiers=None):
+                                  required_mask=0, forbidden_mask=0):
         """
         Procura um genset que agrupa as classes especificadas.
 
         Args:
             general_class: Nome da classe geral
             specific_classes: Lista de nomes das classes específicas
-            required_modifiers: Modificadores que DEVEM estar presentes
-            forbidden_modifiers: Modificadores que NÃO podem estar presentes
+            required_mask: Máscara (_modifier_mask) dos modificadores que DEVEM estar presentes
+            forbidden_mask: Máscara (_modifier_mask) dos modificadores que NÃO podem estar presentes
 
         Returns:
-            Genset encontrado ou None
+            Nome do genset encontrado ou None
         """
-        required_modifiers = required_modifiers or []
-        forbidden_modifiers = forbidden_modifiers or []
+        # Sem gensets no modelo não há o que procurar
+        if not self.gensets:
+            return None
 
-        for genset in self.gensets:
-            # Verificar se a classe geral corresponde
-            if genset.get('general') != general_class:
-                continue
+        specific_set = frozenset(specific_classes)
+        key = (general_class, specific_set, required_mask, forbidden_mask)
+        if key in self._genset_cache:
+            return self._genset_cache[key]
+
+        found = None
 
+        # Só os gensets cuja classe geral corresponde
+        for genset, genset_specifics, genset_mask in self._gensets_by_general.get(general_class, ()):
             # Verificar se as classes específicas estão todas no genset
-            genset_specifics = genset.get('specifics', [])
-            if not all(spec in genset_specifics for spec in specific_classes):
+            if not specific_set.issubset(genset_specifics):
                 continue
 
             # Verificar modificadores obrigatórios
-            genset_modifiers = genset.get('modifiers', [])
-            if not all(mod in genset_modifiers for mod in required_modifiers):
+            if genset_mask & required_mask != required_mask:
                 continue
 
             # Verificar modificadores proibidos
-            if any(mod in genset_modifiers for mod in forbidden_modifiers):
+            if genset_mask & forbidden_mask:
                 continue
 
             # Genset encontrado!
-            return genset
+            found = genset['name']
+            break
 
-        return None
+        self._genset_cache[key] = found
+        return found
 
     def get_summary(self):
         """
@@ -561,8 +517,4 @@ class PatternValidator:
 
     def _count_by_type(self, patterns):
         """Conta padrões por tipo."""
-        counts = {}
-        for pattern in patterns:
-            ptype = pattern['type']
-            counts[ptype] = counts.get(ptype, 0) + 1
-        return counts
+        return Counter(p['type'] for p in patterns)